@@ -118,6 +118,7 @@ export class KnowledgeBaseStack extends Construct implements KnowledgeBaseStackO
         "dynamodb:Query",
         "dynamodb:GetItem",
         "dynamodb:PutItem",
+        "dynamodb:BatchWriteItem",
         "dynamodb:UpdateItem",
         "dynamodb:Describe*",
         "dynamodb:List*",
@@ -177,6 +178,8 @@ export class KnowledgeBaseStack extends Construct implements KnowledgeBaseStackO
           "es:ESHttpPut",
           "es:ESHttpPost",
           "es:ESHttpHead",
+          // helpers.scan clears its scroll with DELETE /_search/scroll
+          "es:ESHttpDelete",
           "bedrock:*",
           "secretsmanager:GetSecretValue",
         ],
@@ -13,18 +13,29 @@ AGENTCORE_ROLE_ARN = os.environ.get('AGENTCORE_ROLE_ARN', '')
 REGION = os.environ.get('AWS_REGION', 'us-east-1')
 OPENAPI_FILE_ARN = os.environ.get('OPENAPI_FILE_ARN', '')
 API_KEY_SECRET_ARN = os.environ.get('API_KEY_SECRET_ARN', '')
+API_KEY_CACHE_TTL = 600
+
+# Clients are created once per execution environment and reused on warm starts
+_SM_CLIENT = boto3.client('secretsmanager', region_name=REGION)
+_GW_CLIENT = boto3.client('bedrock-agentcore-control', region_name=REGION)
+_API_KEY_CACHE = {'value': None, 'expires': 0}
 
 def get_api_key():
-    """Retrieve API key from Secrets Manager"""
+    """Retrieve API key from Secrets Manager (cached for API_KEY_CACHE_TTL seconds)"""
     if not API_KEY_SECRET_ARN:
         logger.warning("API_KEY_SECRET_ARN not set")
         return None
+
+    if _API_KEY_CACHE['value'] and time.time() < _API_KEY_CACHE['expires']:
+        return _API_KEY_CACHE['value']
     
     try:
-        secrets_client = boto3.client('secretsmanager', region_name=REGION)
-        response = secrets_client.get_secret_value(SecretId=API_KEY_SECRET_ARN)
+        response = _SM_CLIENT.get_secret_value(SecretId=API_KEY_SECRET_ARN)
         secret_data = json.loads(response['SecretString'])
-        return secret_data.get('api_key')
+        api_key = secret_data.get('api_key')
+        _API_KEY_CACHE['value'] = api_key
+        _API_KEY_CACHE['expires'] = time.time() + API_KEY_CACHE_TTL
+        return api_key
     except Exception as e:
         logger.error(f"Failed to retrieve API key: {e}")
         return None
@@ -43,7 +54,7 @@ def create_gateway():
         logger.info("Retrieved API key for gateway configuration")
         
         client_id, cognito_discovery_url = get_cognito_discovery_url()
-        gateway_client = boto3.client('bedrock-agentcore-control', region_name=REGION)
+        gateway_client = _GW_CLIENT
 
         # Generate unique names using timestamp
         unique_suffix = str(int(time.time()))
@@ -124,9 +135,10 @@ def create_gateway():
 
 def handler(event, context):
     """Lambda handler for gateway management"""
-    logger.info(f"Received event: {json.dumps(event)}")
-    
     action = event.get('action', 'create')
+    logger.info(f"Received gateway action: {action}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Received event: {json.dumps(event)}")
     
     if action == 'create':
         return create_gateway()
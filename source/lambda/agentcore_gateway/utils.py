@@ -3,10 +3,14 @@ import json
 import time
 from boto3.session import Session
 import botocore
-import requests
+import urllib3
 import os
 import time
 
+# urllib3 ships with botocore, so this adds no dependency and keeps
+# connections to the Cognito token endpoint alive across calls
+_HTTP = urllib3.PoolManager(num_pools=4, maxsize=10, retries=urllib3.Retry(total=2))
+
 def setup_cognito_user_pool():
     boto_session = Session()
     region = boto_session.region_name
@@ -162,15 +166,92 @@ def get_token(user_pool_id: str, client_id: str, client_secret: str, scope_strin
             "scope": scope_string,
 
         }
-        print(client_id)
-        print(client_secret)
-        response = requests.post(url, headers=headers, data=data)
-        response.raise_for_status()
-        return response.json()
+        response = _HTTP.request(
+            'POST', url, fields=data, headers=headers, encode_multipart=False
+        )
+        if response.status >= 400:
+            return {"error": f"{response.status} Error for url: {url}"}
+        return json.loads(response.data)
 
-    except requests.exceptions.RequestException as err:
+    except urllib3.exceptions.HTTPError as err:
         return {"error": str(err)}
     
+def _agentcore_assume_role_policy(account_id, region):
+    """Trust policy letting bedrock-agentcore in this account assume the role"""
+    return {
+        "Version": "2012-10-17",
+        "Statement": [
+            {
+                "Sid": "AssumeRolePolicy",
+                "Effect": "Allow",
+                "Principal": {
+                    "Service": "bedrock-agentcore.amazonaws.com"
+                },
+                "Action": "sts:AssumeRole",
+                "Condition": {
+                    "StringEquals": {
+                        "aws:SourceAccount": f"{account_id}"
+                    },
+                    "ArnLike": {
+                        "aws:SourceArn": f"arn:aws:bedrock-agentcore:{region}:{account_id}:*"
+                    }
+                }
+            }
+        ]
+    }
+
+def _create_or_replace_agentcore_role(iam_client, role_name, role_policy, account_id, region):
+    """Create (or recreate) an AgentCore IAM role with an inline policy"""
+    assume_role_policy_document = _agentcore_assume_role_policy(account_id, region)
+
+    assume_role_policy_document_json = json.dumps(
+        assume_role_policy_document
+    )
+    role_policy_document = json.dumps(role_policy)
+    # Create IAM Role for the Lambda function
+    try:
+        agentcore_iam_role = iam_client.create_role(
+            RoleName=role_name,
+            AssumeRolePolicyDocument=assume_role_policy_document_json
+        )
+
+        # Pause to make sure role is created
+        time.sleep(10)
+    except iam_client.exceptions.EntityAlreadyExistsException:
+        print("Role already exists -- deleting and creating it again")
+        policies = iam_client.list_role_policies(
+            RoleName=role_name,
+            MaxItems=100
+        )
+        print("policies:", policies)
+        for policy_name in policies['PolicyNames']:
+            iam_client.delete_role_policy(
+                RoleName=role_name,
+                PolicyName=policy_name
+            )
+        print(f"deleting {role_name}")
+        iam_client.delete_role(
+            RoleName=role_name
+        )
+        print(f"recreating {role_name}")
+        agentcore_iam_role = iam_client.create_role(
+            RoleName=role_name,
+            AssumeRolePolicyDocument=assume_role_policy_document_json
+        )
+
+    # Attach the AWSLambdaBasicExecutionRole policy
+    print(f"attaching role policy {role_name}")
+    try:
+        iam_client.put_role_policy(
+            PolicyDocument=role_policy_document,
+            PolicyName="AgentCorePolicy",
+            RoleName=role_name
+        )
+    except Exception as e:
+        print(e)
+
+    return agentcore_iam_role
+
 def create_agentcore_role(agent_name):
     iam_client = boto3.client('iam')
     agentcore_role_name = f'agentcore-{agent_name}-role'
@@ -271,75 +352,10 @@ def create_agentcore_role(agent_name):
             }
         ]
     }
-    assume_role_policy_document = {
-        "Version": "2012-10-17",
-        "Statement": [
-            {
-                "Sid": "AssumeRolePolicy",
-                "Effect": "Allow",
-                "Principal": {
-                    "Service": "bedrock-agentcore.amazonaws.com"
-                },
-                "Action": "sts:AssumeRole",
-                "Condition": {
-                    "StringEquals": {
-                        "aws:SourceAccount": f"{account_id}"
-                    },
-                    "ArnLike": {
-                        "aws:SourceArn": f"arn:aws:bedrock-agentcore:{region}:{account_id}:*"
-                    }
-                }
-            }
-        ]
-    }
 
-    assume_role_policy_document_json = json.dumps(
-        assume_role_policy_document
+    return _create_or_replace_agentcore_role(
+        iam_client, agentcore_role_name, role_policy, account_id, region
     )
-    role_policy_document = json.dumps(role_policy)
-    # Create IAM Role for the Lambda function
-    try:
-        agentcore_iam_role = iam_client.create_role(
-            RoleName=agentcore_role_name,
-            AssumeRolePolicyDocument=assume_role_policy_document_json
-        )
-
-        # Pause to make sure role is created
-        time.sleep(10)
-    except iam_client.exceptions.EntityAlreadyExistsException:
-        print("Role already exists -- deleting and creating it again")
-        policies = iam_client.list_role_policies(
-            RoleName=agentcore_role_name,
-            MaxItems=100
-        )
-        print("policies:", policies)
-        for policy_name in policies['PolicyNames']:
-            iam_client.delete_role_policy(
-                RoleName=agentcore_role_name,
-                PolicyName=policy_name
-            )
-        print(f"deleting {agentcore_role_name}")
-        iam_client.delete_role(
-            RoleName=agentcore_role_name
-        )
-        print(f"recreating {agentcore_role_name}")
-        agentcore_iam_role = iam_client.create_role(
-            RoleName=agentcore_role_name,
-            AssumeRolePolicyDocument=assume_role_policy_document_json
-        )
-
-    # Attach the AWSLambdaBasicExecutionRole policy
-    print(f"attaching role policy {agentcore_role_name}")
-    try:
-        iam_client.put_role_policy(
-            PolicyDocument=role_policy_document,
-            PolicyName="AgentCorePolicy",
-            RoleName=agentcore_role_name
-        )
-    except Exception as e:
-        print(e)
-
-    return agentcore_iam_role
 
 def create_agentcore_gateway_role(gateway_name):
     iam_client = boto3.client('iam')
@@ -365,78 +381,10 @@ def create_agentcore_gateway_role(gateway_name):
         ]
     }
 
-    assume_role_policy_document = {
-        "Version": "2012-10-17",
-        "Statement": [
-            {
-                "Sid": "AssumeRolePolicy",
-                "Effect": "Allow",
-                "Principal": {
-                    "Service": "bedrock-agentcore.amazonaws.com"
-                },
-                "Action": "sts:AssumeRole",
-                "Condition": {
-                    "StringEquals": {
-                        "aws:SourceAccount": f"{account_id}"
-                    },
-                    "ArnLike": {
-                        "aws:SourceArn": f"arn:aws:bedrock-agentcore:{region}:{account_id}:*"
-                    }
-                }
-            }
-        ]
-    }
-
-    assume_role_policy_document_json = json.dumps(
-        assume_role_policy_document
+    return _create_or_replace_agentcore_role(
+        iam_client, agentcore_gateway_role_name, role_policy, account_id, region
     )
 
-    role_policy_document = json.dumps(role_policy)
-    # Create IAM Role for the Lambda function
-    try:
-        agentcore_iam_role = iam_client.create_role(
-            RoleName=agentcore_gateway_role_name,
-            AssumeRolePolicyDocument=assume_role_policy_document_json
-        )
-
-        # Pause to make sure role is created
-        time.sleep(10)
-    except iam_client.exceptions.EntityAlreadyExistsException:
-        print("Role already exists -- deleting and creating it again")
-        policies = iam_client.list_role_policies(
-            RoleName=agentcore_gateway_role_name,
-            MaxItems=100
-        )
-        print("policies:", policies)
-        for policy_name in policies['PolicyNames']:
-            iam_client.delete_role_policy(
-                RoleName=agentcore_gateway_role_name,
-                PolicyName=policy_name
-            )
-        print(f"deleting {agentcore_gateway_role_name}")
-        iam_client.delete_role(
-            RoleName=agentcore_gateway_role_name
-        )
-        print(f"recreating {agentcore_gateway_role_name}")
-        agentcore_iam_role = iam_client.create_role(
-            RoleName=agentcore_gateway_role_name,
-            AssumeRolePolicyDocument=assume_role_policy_document_json
-        )
-
-    # Attach the AWSLambdaBasicExecutionRole policy
-    print(f"attaching role policy {agentcore_gateway_role_name}")
-    try:
-        iam_client.put_role_policy(
-            PolicyDocument=role_policy_document,
-            PolicyName="AgentCorePolicy",
-            RoleName=agentcore_gateway_role_name
-        )
-    except Exception as e:
-        print(e)
-
-    return agentcore_iam_role
-
-
 def create_agentcore_gateway_role_s3_smithy(gateway_name):
     iam_client = boto3.client('iam')
     agentcore_gateway_role_name = f'agentcore-{gateway_name}-role'
@@ -462,77 +410,10 @@ def create_agentcore_gateway_role_s3_smithy(gateway_name):
         ]
     }
 
-    assume_role_policy_document = {
-        "Version": "2012-10-17",
-        "Statement": [
-            {
-                "Sid": "AssumeRolePolicy",
-                "Effect": "Allow",
-                "Principal": {
-                    "Service": "bedrock-agentcore.amazonaws.com"
-                },
-                "Action": "sts:AssumeRole",
-                "Condition": {
-                    "StringEquals": {
-                        "aws:SourceAccount": f"{account_id}"
-                    },
-                    "ArnLike": {
-                        "aws:SourceArn": f"arn:aws:bedrock-agentcore:{region}:{account_id}:*"
-                    }
-                }
-            }
-        ]
-    }
-
-    assume_role_policy_document_json = json.dumps(
-        assume_role_policy_document
+    return _create_or_replace_agentcore_role(
+        iam_client, agentcore_gateway_role_name, role_policy, account_id, region
     )
 
-    role_policy_document = json.dumps(role_policy)
-    # Create IAM Role for the Lambda function
-    try:
-        agentcore_iam_role = iam_client.create_role(
-            RoleName=agentcore_gateway_role_name,
-            AssumeRolePolicyDocument=assume_role_policy_document_json
-        )
-
-        # Pause to make sure role is created
-        time.sleep(10)
-    except iam_client.exceptions.EntityAlreadyExistsException:
-        print("Role already exists -- deleting and creating it again")
-        policies = iam_client.list_role_policies(
-            RoleName=agentcore_gateway_role_name,
-            MaxItems=100
-        )
-        print("policies:", policies)
-        for policy_name in policies['PolicyNames']:
-            iam_client.delete_role_policy(
-                RoleName=agentcore_gateway_role_name,
-                PolicyName=policy_name
-            )
-        print(f"deleting {agentcore_gateway_role_name}")
-        iam_client.delete_role(
-            RoleName=agentcore_gateway_role_name
-        )
-        print(f"recreating {agentcore_gateway_role_name}")
-        agentcore_iam_role = iam_client.create_role(
-            RoleName=agentcore_gateway_role_name,
-            AssumeRolePolicyDocument=assume_role_policy_document_json
-        )
-
-    # Attach the AWSLambdaBasicExecutionRole policy
-    print(f"attaching role policy {agentcore_gateway_role_name}")
-    try:
-        iam_client.put_role_policy(
-            PolicyDocument=role_policy_document,
-            PolicyName="AgentCorePolicy",
-            RoleName=agentcore_gateway_role_name
-        )
-    except Exception as e:
-        print(e)
-
-    return agentcore_iam_role
-
 def create_gateway_lambda(lambda_function_code_path) -> dict[str, int]:
     boto_session = Session()
     region = boto_session.region_name
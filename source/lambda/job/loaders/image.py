@@ -7,11 +7,11 @@ import uuid
 from datetime import datetime
 from pathlib import Path
 
-import boto3
 from langchain.docstore.document import Document
 from langchain_community.document_loaders.base import BaseLoader
 from schemas.processing_parameters import ProcessingParameters
 from utils.s3_utils import (
+    get_client,
     load_content_from_s3,
     parse_s3_uri,
     s3_object_exists,
@@ -59,10 +59,7 @@ class SageMakerImageLoader(BaseLoader):
         self.language_code = language_code
         self.vllm_params = vllm_params
         # Initialize clients
-        self.sagemaker_runtime_client = boto3.client(
-            "sagemaker-runtime",
-            region_name=os.environ.get("AWS_REGION", "us-east-1")
-        )
+        self.sagemaker_runtime_client = get_client("sagemaker-runtime")
 
     def invoke_etl_model(self, source_object_key):
         """
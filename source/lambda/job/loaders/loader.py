@@ -1,4 +1,9 @@
-from typing import Any, Callable, Dict, List, Optional
+import itertools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Iterator, Mapping, Optional
 
 from langchain.docstore.document import Document
 from .csv import process_csv
@@ -14,8 +19,18 @@ from .xlsx import process_xlsx
 from schemas.processing_parameters import ProcessingParameters
 from utils.splitter_utils import MarkdownHeaderTextSplitter
 
+
+class _FileProcessorRegistry(dict):
+    """File processor registry that reports unsupported file types on lookup"""
+
+    def __missing__(self, file_type: str):
+        raise ValueError(
+            f"Unsupported file type: '{file_type}'. Supported types are: {', '.join(self)}"
+        )
+
+
 # Registry of file processors mapped by file extension
-FILE_PROCESSORS: Dict[str, Callable] = {
+FILE_PROCESSORS: Mapping[str, Callable] = MappingProxyType(_FileProcessorRegistry({
     "csv": process_csv,
     "doc": process_doc,
     "docx": process_doc,
@@ -30,20 +45,34 @@ FILE_PROCESSORS: Dict[str, Callable] = {
     "jpg": process_image,
     "jpeg": process_image,
     "webp": process_image,
-}
+}))
+
+FILE_TYPES_WITHOUT_SPLITTER = frozenset({"csv", "xlsx", "jsonl"})
 
-FILE_TYPES_WITHOUT_SPLITTER = ["csv", "xlsx", "jsonl"]
+# Splitting uploads the pre-split content to S3 for every document, so larger
+# document lists are split concurrently to overlap those uploads
+PARALLEL_SPLIT_MIN_DOCS = 4
+SPLITTER_MAX_WORKERS = 8
 
 
-def process_object(processing_params: ProcessingParameters) -> List[Document]:
+@lru_cache(maxsize=16)
+def _get_splitter(result_bucket_name: str) -> MarkdownHeaderTextSplitter:
+    """Return a shared splitter per result bucket (the splitter keeps no per-document state)"""
+    return MarkdownHeaderTextSplitter(result_bucket_name)
+
+
+def process_object(processing_params: ProcessingParameters) -> Iterator[Document]:
     """
     Process a document based on its file type using the appropriate processor.
     
+    Split documents are yielded as they are produced so that downstream stages
+    can start before the whole file has been split.
+    
     Args:
         processing_params: Parameters containing file type and other processing information
         
-    Returns:
-        List of Document objects containing the processed content
+    Yields:
+        Document objects containing the processed content
         
     Raises:
         ValueError: If the file type is not supported
@@ -51,21 +80,24 @@ def process_object(processing_params: ProcessingParameters) -> List[Document]:
     file_type = processing_params.file_type.lower()
     
     # Get the appropriate processor function from the registry
-    processor = FILE_PROCESSORS.get(file_type)
-    
-    if not processor:
-        supported_types = ", ".join(FILE_PROCESSORS.keys())
-        raise ValueError(
-            f"Unsupported file type: '{file_type}'. Supported types are: {supported_types}"
-        )
+    processor = FILE_PROCESSORS[file_type]
     
     # Process the document using the selected processor
     doc_list = processor(processing_params)
     if file_type in FILE_TYPES_WITHOUT_SPLITTER:
-        return doc_list
+        yield from doc_list
+        return
+
+    splitter = _get_splitter(processing_params.result_bucket_name)
+    if len(doc_list) <= PARALLEL_SPLIT_MIN_DOCS:
+        # Release each source document once it has been split
+        doc_queue = deque(doc_list)
+        del doc_list
+        while doc_queue:
+            yield from splitter.split_text(doc_queue.popleft())
     else:
-        splitter = MarkdownHeaderTextSplitter(processing_params.result_bucket_name)
-        split_docs = []
-        for doc in doc_list:
-            split_docs.extend(splitter.split_text(doc))
-        return split_docs
+        max_workers = min(SPLITTER_MAX_WORKERS, len(doc_list))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            yield from itertools.chain.from_iterable(
+                executor.map(splitter.split_text, doc_list)
+            )
@@ -7,13 +7,13 @@ import uuid
 from datetime import datetime
 from urllib.parse import urlparse
 
-import boto3
 from langchain.docstore.document import Document
 from schemas.processing_parameters import (
     ProcessingParameters,
     VLLMParameters,
 )
 from utils.s3_utils import (
+    get_client,
     download_file_from_s3,
     load_content_from_s3,
     parse_s3_uri,
@@ -83,10 +83,7 @@ class SageMakerPdfLoader:
         self.chunk_size = chunk_size
         self.vllm_params = vllm_params
         # Initialize clients if not provided
-        self.sagemaker_runtime_client = boto3.client(
-            "sagemaker-runtime",
-            region_name=os.environ.get("AWS_REGION", "us-east-1")
-        )
+        self.sagemaker_runtime_client = get_client("sagemaker-runtime")
 
     def split_pdf(self, local_pdf_path, temp_dir):
         """
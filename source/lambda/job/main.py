@@ -2,20 +2,27 @@ import itertools
 import json
 import logging
 import os
-import traceback
+import threading
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Generator, Iterable, List
+from functools import lru_cache, partial
+from typing import Generator, Iterable, Iterator, List, Optional
 
 import boto3
+import numpy as np
 from langchain.docstore.document import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import OpenSearchVectorSearch
 from langchain_community.vectorstores.opensearch_vector_search import (
     OpenSearchVectorSearch,
+    _default_text_mapping,
 )
 from opensearchpy import RequestsHttpConnection
+from opensearchpy.helpers import parallel_bulk, scan, streaming_bulk
 from requests_aws4auth import AWS4Auth
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import Retrying, retry, stop_after_attempt, wait_exponential
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -23,19 +30,43 @@ logger.setLevel(logging.INFO)
 # Default environment variables
 from schemas.processing_parameters import ProcessingParameters, VLLMParameters
 from utils.constant import SplittingType
+from utils.s3_utils import CLIENT_CONFIG as AWS_CLIENT_CONFIG
 from loaders.loader import process_object
-from utils.storage_utils import save_content_to_s3
+from utils.splitter_utils import FastRecursiveSplitter
+from utils.storage_utils import NDJSONDocumentWriter
 from utils import sm_utils
 
+# Files loaded ahead of the one being ingested. The default of 1 streams each
+# file's documents into chunking; larger values load whole files in parallel
+# and hold up to that many of them in memory at once
+FILE_PROCESSING_WORKERS = int(os.getenv("FILE_PROCESSING_WORKERS", "1"))
+# "byte" stores int8 vectors (lucene engine, cosine space) in newly created
+# indexes; query vectors for such an index must be scaled to int8 as well
+EMBEDDING_VECTOR_DATA_TYPE = os.getenv("EMBEDDING_VECTOR_DATA_TYPE", "float")
+
+
+@lru_cache(maxsize=None)
+def _get_aws_clients(region):
+    """Create the S3 client and DynamoDB resource once per process and region"""
+    s3_client = boto3.client("s3", region_name=region, config=AWS_CLIENT_CONFIG)
+    dynamodb = boto3.resource("dynamodb", region_name=region, config=AWS_CLIENT_CONFIG)
+    return s3_client, dynamodb
+
+
+@lru_cache(maxsize=None)
+def _get_table(region, table_name):
+    """Get a cached DynamoDB Table handle"""
+    _, dynamodb = _get_aws_clients(region)
+    return dynamodb.Table(table_name)
+
 
 def initialize_aws_clients(etl_object_table_name):
-    """Initialize AWS clients"""
+    """Initialize AWS clients, reusing connections across requests"""
     try:
         region = os.getenv("AWS_REGION", "us-east-1")
-        s3_client = boto3.client("s3", region_name=region)
-        dynamodb = boto3.resource("dynamodb", region_name=region)
+        s3_client, dynamodb = _get_aws_clients(region)
         
-        etl_object_table = dynamodb.Table(etl_object_table_name) if etl_object_table_name else None
+        etl_object_table = _get_table(region, etl_object_table_name) if etl_object_table_name else None
         
         return s3_client, dynamodb, etl_object_table
     except Exception as e:
@@ -72,8 +103,23 @@ def get_model_info():
     return embedding_model_info, vlm_model_info
 
 
+@lru_cache(maxsize=None)
+def _get_secrets_client(region):
+    """Create the Secrets Manager client once per process and region"""
+    return boto3.client("secretsmanager", region_name=region, config=AWS_CLIENT_CONFIG)
+
+
+# OpenSearch auth per (region, secret); AOS credentials rotate rarely and
+# AWS4Auth refreshes IAM credentials itself, so entries live for the process
+_aws_auth_cache = {}
+
+
 def get_aws_auth(region, aos_secret="-"):
-    """Get AWS authentication for OpenSearch"""
+    """Get AWS authentication for OpenSearch (cached once resolved)"""
+    cache_key = (region, aos_secret)
+    if cache_key in _aws_auth_cache:
+        return _aws_auth_cache[cache_key]
+
     try:
         credentials = boto3.Session().get_credentials()
     except:
@@ -85,8 +131,7 @@ def get_aws_auth(region, aos_secret="-"):
         
     if aos_secret != "-":
         try:
-            secrets_manager_client = boto3.client("secretsmanager", region_name=region)
-            master_user = secrets_manager_client.get_secret_value(
+            master_user = _get_secrets_client(region).get_secret_value(
                 SecretId=aos_secret
             )["SecretString"]
             cred = json.loads(master_user)
@@ -95,7 +140,8 @@ def get_aws_auth(region, aos_secret="-"):
             aws_auth = (username, password)
         except Exception as e:
             logger.info(f"Error retrieving secret, using IAM authentication: {e}")
-            aws_auth = AWS4Auth(
+            # Not cached, so the next call tries the secret again
+            return AWS4Auth(
                 refreshable_credentials=credentials, region=region, service="es"
             )
     else:
@@ -103,15 +149,62 @@ def get_aws_auth(region, aos_secret="-"):
         aws_auth = AWS4Auth(
             refreshable_credentials=credentials, region=region, service="es"
         )
+    _aws_auth_cache[cache_key] = aws_auth
     return aws_auth
 
 
+class StatusBuffer:
+    """
+    Buffer ETL object status items and write them with BatchWriteItem.
+
+    Only final (COMPLETED/FAILED) statuses are buffered; they are flushed
+    every ``flush_size`` puts for a table and whenever ``flush`` is called.
+    ingestion_pipeline flushes after every file, so a worker that dies
+    mid-job loses no status of a file it already finished.
+    """
+
+    def __init__(self, flush_size: int = 25):
+        self.flush_size = flush_size
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def put(self, etl_table, item: dict):
+        with self._lock:
+            pending = self._pending.setdefault(etl_table.name, (etl_table, []))[1]
+            pending.append(item)
+            if len(pending) < self.flush_size:
+                return
+            self._pending.pop(etl_table.name)
+        self._write(etl_table, pending)
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for etl_table, items in pending.values():
+            self._write(etl_table, items)
+
+    @staticmethod
+    def _write(etl_table, items):
+        try:
+            with etl_table.batch_writer(overwrite_by_pkeys=["s3Path", "executionId"]) as writer:
+                for item in items:
+                    writer.put_item(Item=item)
+        except Exception as e:
+            logger.warning(f"Could not update ETL object table: {e}")
+
+
+status_buffer = StatusBuffer()
+
+
 def update_etl_object_table(
     processing_params: ProcessingParameters, status: str, detail: str = "", etl_table=None, execution_id=""
 ):
     """
     Update the etl object table with the processing parameters.
 
+    RUNNING is written immediately so progress is visible while the file is
+    processed; final statuses are batched through StatusBuffer.
+
     Args:
         processing_params (ProcessingParameters): The processing parameters.
         etl_table: The ETL object table instance.
@@ -121,7 +214,7 @@ def update_etl_object_table(
         if not etl_table:
             logger.warning(f"ETL object table not available, status: {status}, not update ETL object table")
             return
-            
+
         input_body = {
             "s3Path": f"s3://{processing_params.source_bucket_name}/{processing_params.source_object_key}",
             "s3Bucket": processing_params.source_bucket_name,
@@ -131,14 +224,17 @@ def update_etl_object_table(
             "status": status,
             "detail": detail,
         }
-        etl_table.put_item(Item=input_body)
+        if status == "RUNNING":
+            etl_table.put_item(Item=input_body)
+        else:
+            status_buffer.put(etl_table, input_body)
     except Exception as e:
         logger.warning(f"Could not update ETL object table: {e}")
 
 
 class S3FileIterator:
     def __init__(
-        self, bucket: str, prefix: str, supported_file_types: List[str] = [], s3_client=None, batch_file_number="10", batch_indice="0", document_language="zh", etl_endpoint_name="", res_bucket="", portal_bucket_name="", vlm_model_info=None, etl_table=None, execution_id=""
+        self, bucket: str, prefix: str, supported_file_types: List[str] = [], s3_client=None, batch_file_number="10", batch_indice="0", document_language="zh", etl_endpoint_name="", res_bucket="", portal_bucket_name="", vlm_model_info=None, etl_table=None, execution_id="", start_after=""
     ):
         self.bucket = bucket
         self.prefix = prefix
@@ -154,6 +250,11 @@ class S3FileIterator:
         self.vlm_model_info = vlm_model_info or {}
         self.etl_table = etl_table
         self.execution_id = execution_id
+        self.start_after = start_after
+        # Parsed once; iterate_s3_files checks these for every listed key
+        self._supported = frozenset(t.lower() for t in supported_file_types)
+        self._batch_lo = int(batch_indice) * int(batch_file_number)
+        self._batch_hi = self._batch_lo + int(batch_file_number)
         if s3_client:
             self.paginator = s3_client.get_paginator("list_objects_v2")
         else:
@@ -173,64 +274,55 @@ class S3FileIterator:
             )
             return
             
-        current_indice = 0
-        for page in self.paginator.paginate(
-            Bucket=self.bucket, Prefix=self.prefix
+        # Only supported objects count towards the batch window
+        for key, file_type in itertools.islice(
+            self._iter_objects(), self._batch_lo, self._batch_hi
         ):
-            for obj in page.get("Contents", []):
-                key = obj["Key"]
-                file_type = key.split(".")[-1].lower()  # Extract file extension
-
-                if (
-                    key.endswith("/")
-                    or file_type not in self.supported_file_types
-                ):
-                    continue
-
-                if current_indice < int(self.batch_indice) * int(self.batch_file_number):
-                    current_indice += 1
-                    continue
-                elif current_indice >= (int(self.batch_indice) + 1) * int(
-                    self.batch_file_number
-                ):
-                    # Exit this nested loop
-                    break
-                else:
-                    logger.info("Processing object: %s", key)
-                    current_indice += 1
-
-                    # Create VLLM parameters
-                    vllm_params = VLLMParameters(
-                        model_provider=self.vlm_model_info.get("modelProvider", "Bedrock"),
-                        model_id=self.vlm_model_info.get("modelId", "anthropic.claude-3-sonnet-20240229-v1:0"),
-                        model_api_url=self.vlm_model_info.get("baseUrl", ""),
-                        model_secret_name=self.vlm_model_info.get("apiKeyArn", ""),
-                        model_sagemaker_endpoint_name=self.vlm_model_info.get(
-                            "modelEndpoint", ""
-                        ),
-                    )
+            logger.info("Processing object: %s", key)
+
+            # Create VLLM parameters
+            vllm_params = VLLMParameters(
+                model_provider=self.vlm_model_info.get("modelProvider", "Bedrock"),
+                model_id=self.vlm_model_info.get("modelId", "anthropic.claude-3-sonnet-20240229-v1:0"),
+                model_api_url=self.vlm_model_info.get("baseUrl", ""),
+                model_secret_name=self.vlm_model_info.get("apiKeyArn", ""),
+                model_sagemaker_endpoint_name=self.vlm_model_info.get(
+                    "modelEndpoint", ""
+                ),
+            )
 
-                    # Create processing parameters with VLLM parameters
-                    processing_params = ProcessingParameters(
-                        source_bucket_name=self.bucket,
-                        source_object_key=key,
-                        etl_endpoint_name=self.etl_endpoint_name,
-                        result_bucket_name=self.res_bucket,
-                        portal_bucket_name=self.portal_bucket_name,
-                        document_language=self.document_language,
-                        file_type=file_type,
-                        vllm_parameters=vllm_params,
-                    )
+            # Create processing parameters with VLLM parameters
+            processing_params = ProcessingParameters(
+                source_bucket_name=self.bucket,
+                source_object_key=key,
+                etl_endpoint_name=self.etl_endpoint_name,
+                result_bucket_name=self.res_bucket,
+                portal_bucket_name=self.portal_bucket_name,
+                document_language=self.document_language,
+                file_type=file_type,
+                vllm_parameters=vllm_params,
+            )
 
-                    update_etl_object_table(processing_params, "RUNNING", "", self.etl_table, self.execution_id)
+            update_etl_object_table(processing_params, "RUNNING", "", self.etl_table, self.execution_id)
 
-                    yield processing_params
+            yield processing_params
 
-            if current_indice >= (int(self.batch_indice) + 1) * int(
-                self.batch_file_number
-            ):
-                # Exit the outer loop
-                break
+    def _iter_objects(self) -> Iterator[tuple]:
+        """Yield (key, file_type) for supported objects under the prefix"""
+        paginate_kwargs = {
+            "Bucket": self.bucket,
+            "Prefix": self.prefix,
+            "PaginationConfig": {"PageSize": 1000},
+        }
+        if self.start_after:
+            # Let S3 skip keys already handled by a previous batch
+            paginate_kwargs["StartAfter"] = self.start_after
+        for page in self.paginator.paginate(**paginate_kwargs):
+            for obj in page.get("Contents", []):
+                key = obj["Key"]
+                file_type = key.split(".")[-1].lower()  # Extract file extension
+                if not key.endswith("/") and file_type in self._supported:
+                    yield key, file_type
 
 
 class BatchChunkDocumentProcessor:
@@ -260,6 +352,18 @@ class BatchChunkDocumentProcessor:
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         self.batch_size = batch_size
+        self.text_splitter = None
+        if os.getenv("USE_FAST_SPLITTER", "false").lower() == "true":
+            try:
+                self.text_splitter = FastRecursiveSplitter(
+                    chunk_size=self.chunk_size, chunk_overlap=self.chunk_overlap
+                )
+            except ImportError as e:
+                logger.warning(f"{e} Falling back to RecursiveCharacterTextSplitter.")
+        if self.text_splitter is None:
+            self.text_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=self.chunk_size, chunk_overlap=self.chunk_overlap
+            )
 
     def chunk_generator(
         self, content: List[Document]
@@ -274,38 +378,26 @@ class BatchChunkDocumentProcessor:
             Document: A chunk of a document.
 
         """
-        temp_text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=self.chunk_size, chunk_overlap=self.chunk_overlap
-        )
-        temp_content = content
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=self.chunk_size, chunk_overlap=self.chunk_overlap
-        )
-        updated_heading_hierarchy = {}
-        for temp_document in temp_content:
-            temp_chunk_id = temp_document.metadata["chunk_id"]
-            temp_split_size = len(
-                temp_text_splitter.split_documents([temp_document])
-            )
-            # Add size in heading_hierarchy
-            if "heading_hierarchy" in temp_document.metadata:
-                temp_hierarchy = temp_document.metadata["heading_hierarchy"]
-                temp_hierarchy["size"] = temp_split_size
-                updated_heading_hierarchy[temp_chunk_id] = temp_hierarchy
-
         for document in content:
-            splits = text_splitter.split_documents([document])
+            splits = self.text_splitter.split_documents([document])
+            # Add size in heading_hierarchy
+            heading_hierarchy = document.metadata.get("heading_hierarchy")
+            if heading_hierarchy is not None:
+                heading_hierarchy["size"] = len(splits)
             # List of Document objects
             index = 1
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Split chunk %s into %d pieces, heading hierarchy: %s",
+                    document.metadata.get("chunk_id"),
+                    len(splits),
+                    heading_hierarchy,
+                )
             for split in splits:
                 chunk_id = split.metadata["chunk_id"]
-                logger.info(chunk_id)
                 split.metadata["chunk_id"] = f"{chunk_id}-{index}"
-                if chunk_id in updated_heading_hierarchy:
-                    split.metadata["heading_hierarchy"] = (
-                        updated_heading_hierarchy[chunk_id]
-                    )
-                    logger.info(split.metadata["heading_hierarchy"])
+                if heading_hierarchy is not None:
+                    split.metadata["heading_hierarchy"] = heading_hierarchy
                 index += 1
                 yield split
 
@@ -356,50 +448,53 @@ class BatchQueryDocumentProcessor:
         self.docsearch = docsearch
         self.batch_size = batch_size
 
-    def query_documents(self, s3_path) -> Iterable:
+    def query_documents(self, s3_path) -> Iterator[str]:
         """
         Queries documents based on the given S3 path.
 
+        Ids are streamed from a scroll, so deletes can start before the scan
+        finishes and files with more than 10000 chunks are fully covered.
+
         Args:
             s3_path (str): The S3 path to query documents from.
 
         Returns:
-            Iterable: An iterable of document IDs.
+            Iterator[str]: An iterator of document IDs.
         """
         if not self.docsearch:
             logger.warning("DocSearch not available")
-            return []
-            
-        search_body = {
-            "query": {
-                # use term-level queries only for fields mapped as keyword
-                "prefix": {"metadata.file_path.keyword": {"value": s3_path}},
-            },
-            "size": 10000,
-            "sort": [{"_score": {"order": "desc"}}],
-            "_source": {"excludes": ["vector_field"]},
-        }
+            return
 
-        if self.docsearch.client.indices.exists(
+        if not self.docsearch.client.indices.exists(
             index=self.docsearch.index_name
         ):
-            logger.info(
-                "BatchQueryDocumentProcessor: Querying documents for %s",
-                s3_path,
-            )
-            query_documents = self.docsearch.client.search(
-                index=self.docsearch.index_name, body=search_body
-            )
-            document_ids = [
-                doc["_id"] for doc in query_documents["hits"]["hits"]
-            ]
-            return document_ids
-        else:
             logger.info(
                 "BatchQueryDocumentProcessor: Index %s does not exist, skipping deletion",
                 self.docsearch.index_name,
             )
-            return []
+            return
+
+        # use term-level queries only for fields mapped as keyword; a single
+        # object is an exact term match, only a "directory/" needs a prefix
+        match_type = "prefix" if s3_path.endswith("/") else "term"
+        search_body = {
+            "query": {
+                match_type: {"metadata.file_path.keyword": {"value": s3_path}},
+            },
+        }
+        logger.info(
+            "BatchQueryDocumentProcessor: Querying documents for %s",
+            s3_path,
+        )
+        # Unscored, unsorted scroll; only the ids are needed
+        for hit in scan(
+            self.docsearch.client,
+            index=self.docsearch.index_name,
+            query=search_body,
+            _source=False,
+            size=1000,
+        ):
+            yield hit["_id"]
 
     def batch_generator(self, s3_path):
         """
@@ -421,18 +516,178 @@ class BatchQueryDocumentProcessor:
 
 
 class OpenSearchIngestionWorker:
+    """
+    Embeds documents and indexes them into OpenSearch with bulk requests.
+
+    Args:
+        docsearch (OpenSearchVectorSearch): The target vector store.
+        embedding_model_id (str): The id of the embedding model.
+        embedding_batch_size (int): Number of documents embedded per model call.
+        chunk_size (int): Number of documents per bulk request.
+        vector_data_type (str): "float" or "byte"; only used when this worker creates the index.
+    """
+
+    # Used instead of "-1" while bulk loading: if the job dies before
+    # resume_refresh, the index still refreshes and new documents show up
+    BULK_REFRESH_INTERVAL = "30s"
+
     def __init__(
         self,
         docsearch: OpenSearchVectorSearch,
         embedding_model_id: str,
+        embedding_batch_size: int = 100,
+        chunk_size: int = 500,
+        vector_data_type: str = EMBEDDING_VECTOR_DATA_TYPE,
     ):
         self.docsearch = docsearch
+        self.vector_data_type = vector_data_type
         self.embedding_model_id = embedding_model_id
+        self.embedding_batch_size = embedding_batch_size
+        self.chunk_size = chunk_size
+        self._index_ready = False
+        self._refresh_paused = False
+        # refresh_interval to restore after bulk loading; None resets to the default
+        self._saved_refresh_interval = None
+
+    def _ensure_index(self, dim: int) -> None:
+        """Create the k-NN index with the LangChain default mapping if it does not exist"""
+        if self._index_ready:
+            return
+        index_name = self.docsearch.index_name
+        if not self.docsearch.client.indices.exists(index=index_name):
+            if self.vector_data_type == "byte":
+                # Byte vectors need the lucene engine; cosine ignores the
+                # per-vector scale applied by _quantize_int8
+                body = _default_text_mapping(dim, engine="lucene", space_type="cosinesimil")
+                body["mappings"]["properties"]["vector_field"]["data_type"] = "byte"
+            else:
+                body = _default_text_mapping(dim)
+            if self._refresh_paused:
+                body["settings"]["index"]["refresh_interval"] = self.BULK_REFRESH_INTERVAL
+            self.docsearch.client.indices.create(index=index_name, body=body)
+        else:
+            # Follow the existing mapping so float indexes keep float vectors
+            mapping = self.docsearch.client.indices.get_mapping(index=index_name)
+            vector_field = next(iter(mapping.values()))["mappings"]["properties"].get("vector_field", {})
+            self.vector_data_type = vector_field.get("data_type", "float")
+        self._index_ready = True
+
+    @staticmethod
+    def _quantize_int8(embeddings_vectors):
+        """Scale each vector by its max-abs value into int8, returning (vectors, scales)"""
+        vectors = np.asarray(embeddings_vectors, dtype=np.float32)
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        quantized = np.round(np.clip(vectors / scales[:, None], -127, 127)).astype(np.int8)
+        return quantized.tolist(), scales.tolist()
+
+    def _get_refresh_interval(self) -> Optional[str]:
+        index_name = self.docsearch.index_name
+        if not self.docsearch.client.indices.exists(index=index_name):
+            return None
+        try:
+            settings = self.docsearch.client.indices.get_settings(
+                index=index_name, name="index.refresh_interval", flat_settings=True
+            )
+        except Exception as e:
+            logger.warning("Could not read refresh_interval of %s: %s", index_name, e)
+            return None
+        interval = next(iter(settings.values()), {}).get("settings", {}).get("index.refresh_interval")
+        # Another job is bulk loading, or a crashed one left "-1" behind;
+        # fall back to the default then
+        return None if interval in ("-1", self.BULK_REFRESH_INTERVAL) else interval
+
+    def _put_refresh_interval(self, interval: Optional[str]) -> None:
+        index_name = self.docsearch.index_name
+        if not self.docsearch.client.indices.exists(index=index_name):
+            return
+        try:
+            self.docsearch.client.indices.put_settings(
+                index=index_name, body={"index": {"refresh_interval": interval}}
+            )
+        except Exception as e:
+            logger.warning("Could not set refresh_interval on %s: %s", index_name, e)
+
+    def pause_refresh(self) -> None:
+        """Slow periodic refreshes down so bulk indexing does not churn segments"""
+        if not self.docsearch or self._refresh_paused:
+            return
+        self._refresh_paused = True
+        self._saved_refresh_interval = self._get_refresh_interval()
+        self._put_refresh_interval(self.BULK_REFRESH_INTERVAL)
+
+    def resume_refresh(self) -> None:
+        """Restore the index's previous refresh interval and make new documents searchable"""
+        if not self.docsearch or not self._refresh_paused:
+            return
+        self._refresh_paused = False
+        self._put_refresh_interval(self._saved_refresh_interval)
+        if self.docsearch.client.indices.exists(index=self.docsearch.index_name):
+            self.docsearch.client.indices.refresh(index=self.docsearch.index_name)
+
+    def _build_actions(self, texts, embeddings_vectors, metadatas) -> Generator:
+        for text, vector, metadata in zip(texts, embeddings_vectors, metadatas):
+            yield {
+                "_op_type": "index",
+                "_index": self.docsearch.index_name,
+                "_id": str(uuid.uuid4()),
+                "vector_field": vector,
+                "text": text,
+                "metadata": metadata,
+            }
+
+    def _bulk_index(self, actions: List[dict]) -> None:
+        """
+        Index actions with bulk requests, resending only the throttled ones.
+
+        Raises if any document is rejected for another reason so that the
+        file is marked FAILED instead of COMPLETED with missing chunks.
+        """
+        pending = {action["_id"]: action for action in actions}
+        failed = []
+        for attempt in Retrying(
+            stop=stop_after_attempt(3),
+            wait=wait_exponential(multiplier=1, min=4, max=10),
+            reraise=True,
+        ):
+            with attempt:
+                throttled = {}
+                for ok, item in streaming_bulk(
+                    self.docsearch.client,
+                    list(pending.values()),
+                    chunk_size=self.chunk_size,
+                    max_chunk_bytes=100 * 1024 * 1024,
+                    raise_on_error=False,
+                ):
+                    if ok:
+                        continue
+                    result = item.get("index", {})
+                    if result.get("status") == 429:
+                        throttled[result["_id"]] = pending[result["_id"]]
+                    else:
+                        logger.error(
+                            "Failed to index document %s: %s",
+                            result.get("_id"),
+                            result.get("error"),
+                        )
+                        failed.append(result)
+                pending = throttled
+                if pending:
+                    raise Exception(
+                        f"{len(pending)} documents throttled by OpenSearch"
+                    )
+        if failed:
+            raise Exception(
+                f"{len(failed)} documents failed to index: {failed[0].get('error')}"
+            )
 
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=4, max=10),
     )
+    def _embed(self, texts: List[str]) -> list:
+        return self.docsearch.embedding_function.embed_documents(texts)
+
     def aos_ingestion(self, documents: List[Document]) -> None:
         if not self.docsearch:
             logger.info("OpenSearch not available, skipping ingestion")
@@ -440,9 +695,7 @@ class OpenSearchIngestionWorker:
             
         texts = [doc.page_content for doc in documents]
         metadatas = [doc.metadata for doc in documents]
-        embeddings_vectors = self.docsearch.embedding_function.embed_documents(
-            list(texts)
-        )
+        embeddings_vectors = self._embed(texts)
 
         if isinstance(embeddings_vectors[0], dict):
             embeddings_vectors_list = []
@@ -455,127 +708,220 @@ class OpenSearchIngestionWorker:
                 metadata_list.append(metadata)
             embeddings_vectors = embeddings_vectors_list
             metadatas = metadata_list
-        self.docsearch._OpenSearchVectorSearch__add(
-            texts, embeddings_vectors, metadatas=metadatas
+
+        self._ensure_index(len(embeddings_vectors[0]))
+        if self.vector_data_type == "byte":
+            embeddings_vectors, scales = self._quantize_int8(embeddings_vectors)
+            for metadata, scale in zip(metadatas, scales):
+                metadata["embedding_scale"] = scale
+        self._bulk_index(
+            list(self._build_actions(texts, embeddings_vectors, metadatas))
         )
+        if not self._refresh_paused:
+            self.docsearch.client.indices.refresh(index=self.docsearch.index_name)
 
 
 class OpenSearchDeleteWorker:
-    def __init__(self, docsearch: OpenSearchVectorSearch):
+    def __init__(self, docsearch: OpenSearchVectorSearch, thread_count: int = 4, chunk_size: int = 1000):
         self.docsearch = docsearch
         self.index_name = self.docsearch.index_name if docsearch else None
+        self.thread_count = thread_count
+        self.chunk_size = chunk_size
 
-    def aos_deletion(self, document_ids) -> None:
+    def aos_deletion(self, document_ids: Iterable[str]) -> None:
+        """Delete the given ids (typically a lazy query stream) and refresh once"""
         if not self.docsearch:
             logger.info("OpenSearch not available, skipping deletion")
             return
-            
-        bulk_delete_requests = []
 
         # Check if self.index_name exists
         if not self.docsearch.client.indices.exists(index=self.index_name):
             logger.info("Index %s does not exist", self.index_name)
             return
-        else:
-            for document_id in document_ids:
-                bulk_delete_requests.append(
-                    {"delete": {"_id": document_id, "_index": self.index_name}}
-                )
 
-            self.docsearch.client.bulk(
-                index=self.index_name, body=bulk_delete_requests, refresh=True
-            )
-            logger.info("Deleted %d documents", len(document_ids))
-            return
+        actions = (
+            {"_op_type": "delete", "_index": self.index_name, "_id": document_id}
+            for document_id in document_ids
+        )
+        deleted = 0
+        for ok, item in parallel_bulk(
+            self.docsearch.client,
+            actions,
+            thread_count=self.thread_count,
+            chunk_size=self.chunk_size,
+            raise_on_error=False,
+        ):
+            if ok:
+                deleted += 1
+            else:
+                logger.warning("Failed to delete document: %s", item)
+        if deleted:
+            self.docsearch.client.indices.refresh(index=self.index_name)
+        logger.info("Deleted %d documents", deleted)
 
 
-def ingestion_pipeline(
-    s3_files_iterator,
+def _load_documents(processing_params) -> List[Document]:
+    """Load and split one S3 object (runs on the ingestion thread pool)"""
+    return list(process_object(processing_params))
+
+
+def _ingest_documents(
+    processing_params,
+    documents,
     batch_chunk_processor,
     ingestion_worker,
     extract_only=False,
     s3_client_param=None,
-    etl_table=None,
-    execution_id=""
 ):
-    for processing_params in s3_files_iterator:
-        try:
-            # The res is list[Document] type
-            documents = process_object(processing_params)
-            for document in documents:
-                save_content_to_s3(
-                    s3_client_param,
-                    document,
-                    processing_params.result_bucket_name,
-                    SplittingType.SEMANTIC.value,
+    semantic_writer = NDJSONDocumentWriter(SplittingType.SEMANTIC.value)
+
+    def saved(documents):
+        # Record each semantic document as it flows into chunking
+        for document in documents:
+            semantic_writer.write(document)
+            yield document
+
+    gen_chunk_flag = (
+        False
+        if processing_params.file_type in ["csv", "xlsx", "xls"]
+        else True
+    )
+    batches = batch_chunk_processor.batch_generator(
+        saved(documents), gen_chunk_flag
+    )
+
+    ordered_chunk_id = 0
+    chunk_writer = NDJSONDocumentWriter(SplittingType.CHUNK.value)
+    # Chunk batches are small; accumulate them so the embedding model
+    # is called once per embedding_batch_size documents
+    pending_documents = []
+
+    for batch in batches:
+        if len(batch) == 0:
+            continue
+
+        for document in batch:
+            document.metadata["ordered_chunk_id"] = ordered_chunk_id
+            ordered_chunk_id += 1
+
+            if "complete_heading" in document.metadata:
+                document.page_content = (
+                    document.metadata["complete_heading"]
+                    + " "
+                    + document.page_content
                 )
+            else:
+                document.page_content = document.page_content
 
-            gen_chunk_flag = (
-                False
-                if processing_params.file_type in ["csv", "xlsx", "xls"]
-                else True
-            )
-            batches = batch_chunk_processor.batch_generator(
-                documents, gen_chunk_flag
-            )
+            chunk_writer.write(document)
 
-            ordered_chunk_id = 0
+        if not extract_only:
+            pending_documents.extend(batch)
+            if len(pending_documents) >= ingestion_worker.embedding_batch_size:
+                ingestion_worker.aos_ingestion(pending_documents)
+                pending_documents = []
 
-            for batch in batches:
-                if len(batch) == 0:
-                    continue
+    semantic_writer.upload(s3_client_param, processing_params.result_bucket_name)
+    chunk_writer.upload(s3_client_param, processing_params.result_bucket_name)
 
-                for document in batch:
-                    document.metadata["ordered_chunk_id"] = ordered_chunk_id
-                    ordered_chunk_id += 1
+    if pending_documents:
+        ingestion_worker.aos_ingestion(pending_documents)
 
-                    if "complete_heading" in document.metadata:
-                        document.page_content = (
-                            document.metadata["complete_heading"]
-                            + " "
-                            + document.page_content
-                        )
-                    else:
-                        document.page_content = document.page_content
 
-                    save_content_to_s3(
-                        s3_client_param,
-                        document,
-                        processing_params.result_bucket_name,
-                        SplittingType.CHUNK.value,
-                    )
+def ingestion_pipeline(
+    s3_files_iterator,
+    batch_chunk_processor,
+    ingestion_worker,
+    extract_only=False,
+    s3_client_param=None,
+    etl_table=None,
+    execution_id="",
+    max_workers=FILE_PROCESSING_WORKERS,
+    delete_processor=None,
+    delete_worker=None,
+):
+    """
+    Load files on a bounded thread pool while chunking, embedding and status
+    updates for finished files run in order on the calling thread.
+
+    With max_workers=1 (the default) nothing is prefetched and documents
+    flow from process_object into chunking without being collected into a
+    list. The per-file NDJSON buffers are still kept until the file is done,
+    and the loader holds all splits when it splits a file in parallel.
 
-                if not extract_only:
-                    ingestion_worker.aos_ingestion(batch)
+    When delete_processor and delete_worker are given (update jobs), the
+    existing chunks of each file are deleted right before it is ingested.
+    """
+
+    def finish(processing_params, load_documents):
+        try:
+            # A list[Document] from the pool, or a lazy Iterator[Document]
+            documents = load_documents()
+            if delete_worker is not None:
+                _delete_documents(processing_params, delete_processor, delete_worker)
+            _ingest_documents(
+                processing_params,
+                documents,
+                batch_chunk_processor,
+                ingestion_worker,
+                extract_only,
+                s3_client_param,
+            )
             update_etl_object_table(processing_params, "COMPLETED", "", etl_table, execution_id)
         except Exception as e:
-            logger.error(
+            logger.exception(
                 "Error processing object %s: %s",
                 f"{processing_params.source_bucket_name}/{processing_params.source_object_key}",
                 e,
             )
             update_etl_object_table(processing_params, "FAILED", str(e), etl_table, execution_id)
-            traceback.print_exc()
+        finally:
+            status_buffer.flush()
+
+    if not extract_only:
+        # Refresh once at the end instead of after every bulk batch
+        ingestion_worker.pause_refresh()
+    try:
+        if max_workers <= 1:
+            for processing_params in s3_files_iterator:
+                finish(processing_params, partial(process_object, processing_params))
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # At most max_workers files are loaded ahead of the one being ingested
+                in_flight = deque()
+                for processing_params in s3_files_iterator:
+                    in_flight.append(
+                        (
+                            processing_params,
+                            executor.submit(_load_documents, processing_params).result,
+                        )
+                    )
+                    if len(in_flight) >= max_workers:
+                        finish(*in_flight.popleft())
+                while in_flight:
+                    finish(*in_flight.popleft())
+    finally:
+        if not extract_only:
+            ingestion_worker.resume_refresh()
+
+
+def _delete_documents(processing_params, document_generator, delete_worker):
+    s3_path = f"s3://{processing_params.source_bucket_name}/{processing_params.source_object_key}"
+
+    # Stream every id of the file into one bulk delete and one refresh
+    delete_worker.aos_deletion(document_generator.query_documents(s3_path))
 
 
 def delete_pipeline(s3_files_iterator, document_generator, delete_worker):
     for processing_params in s3_files_iterator:
         try:
-            s3_path = f"s3://{processing_params.source_bucket_name}/{processing_params.source_object_key}"
-
-            batches = document_generator.batch_generator(s3_path)
-            for batch in batches:
-                if len(batch) == 0:
-                    continue
-                delete_worker.aos_deletion(batch)
-
+            _delete_documents(processing_params, document_generator, delete_worker)
         except Exception as e:
-            logger.error(
+            logger.exception(
                 "Error processing object %s: %s",
                 f"{processing_params.source_bucket_name}/{processing_params.source_object_key}",
                 e,
             )
-            traceback.print_exc()
 
 
 def create_processors_and_workers(
@@ -659,6 +1005,8 @@ def main(request, job_id: str):
     bedrock_region = get_param_value(getattr(request, 'bedrock_region', None), "BEDROCK_REGION", "us-east-1")
     res_bucket = get_param_value(getattr(request, 'res_bucket', None), "RES_BUCKET", "")
     aos_index_name = get_param_value(getattr(request, 'aos_index_name', None), "INDEX_ID", "")
+    # Last key of a previous batch; when set, batch_indice counts from this key
+    start_after = get_param_value(getattr(request, 'start_after', None), "S3_START_AFTER", "")
 
     if index_type == "qq" or index_type == "intention":
         supported_file_types = ["jsonl", "xlsx", "xls"]
@@ -692,7 +1040,8 @@ def main(request, job_id: str):
     file_iterator = S3FileIterator(
         s3_bucket, s3_prefix, supported_file_types, s3_client_local, 
         batch_file_number, batch_indice, document_language, etl_endpoint_name, 
-        res_bucket, portal_bucket_name, vlm_model_info, etl_object_table_local, job_id
+        res_bucket, portal_bucket_name, vlm_model_info, etl_object_table_local, job_id,
+        start_after
     )
 
     if operation_type == "extract_only":
@@ -727,26 +1076,29 @@ def main(request, job_id: str):
         file_iterator,
     )
     
-    if operation_type == "create":
-        ingestion_pipeline(s3_files_iterator, batch_processor, worker, False, s3_client_local, etl_object_table_local, job_id)
-    elif operation_type == "extract_only":
-        ingestion_pipeline(
-            s3_files_iterator, batch_processor, worker, extract_only=True, s3_client_param=s3_client_local, etl_table=etl_object_table_local, execution_id=job_id
-        )
-    elif operation_type == "delete":
-        delete_pipeline(s3_files_iterator, batch_processor, worker)
-    elif operation_type == "update":
-        # Delete the documents first
-        delete_pipeline(s3_files_iterator, batch_processor, worker)
-
-        # Then ingest the documents
-        s3_files_iterator, batch_processor, worker = (
-            create_processors_and_workers(
+    try:
+        if operation_type == "create":
+            ingestion_pipeline(s3_files_iterator, batch_processor, worker, False, s3_client_local, etl_object_table_local, job_id)
+        elif operation_type == "extract_only":
+            ingestion_pipeline(
+                s3_files_iterator, batch_processor, worker, extract_only=True, s3_client_param=s3_client_local, etl_table=etl_object_table_local, execution_id=job_id
+            )
+        elif operation_type == "delete":
+            delete_pipeline(s3_files_iterator, batch_processor, worker)
+        elif operation_type == "update":
+            # Single listing pass: each file's old documents are deleted
+            # right before its new chunks are ingested
+            _, chunk_processor, ingestion_worker = create_processors_and_workers(
                 "create", docsearch, embedding_model_id, file_iterator
             )
-        )
-        ingestion_pipeline(s3_files_iterator, batch_processor, worker, False, s3_client_local, etl_object_table_local, job_id)
-    else:
-        raise ValueError(
-            "Invalid operation type. Valid types: create, delete, update, extract_only"
-        )
+            ingestion_pipeline(
+                s3_files_iterator, chunk_processor, ingestion_worker, False, s3_client_local, etl_object_table_local, job_id,
+                delete_processor=batch_processor, delete_worker=worker,
+            )
+        else:
+            raise ValueError(
+                "Invalid operation type. Valid types: create, delete, update, extract_only"
+            )
+    finally:
+        # Write any final status still buffered if the pipeline was interrupted
+        status_buffer.flush()
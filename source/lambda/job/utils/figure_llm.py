@@ -9,10 +9,9 @@ import tempfile
 from datetime import datetime
 from typing import Union
 
-import boto3
 import requests
 from schemas.processing_parameters import VLLMParameters
-from utils.s3_utils import upload_file_to_s3
+from utils.s3_utils import get_client, upload_file_to_s3
 from utils.secrets_manager_utils import get_api_key
 from openai import OpenAI
 from PIL import Image
@@ -124,9 +123,7 @@ class figureUnderstand:
                 )
 
             # Initialize Bedrock client and model ID
-            self.bedrock_runtime = boto3.client(
-                service_name="bedrock-runtime", region_name=bedrock_region
-            )
+            self.bedrock_runtime = get_client("bedrock-runtime", bedrock_region)
 
             # Add model prefix if not provided
             model_prefix = bedrock_region.split("-")[0] + "."
@@ -153,10 +150,7 @@ class figureUnderstand:
                 raise ValueError(
                     "SageMaker endpoint name is required when using SageMaker model"
                 )
-            self.sagemaker_client = boto3.client(
-                "sagemaker-runtime",
-                region_name=os.environ.get("AWS_REGION", "us-east-1")
-            )
+            self.sagemaker_client = get_client("sagemaker-runtime")
             self.model_sagemaker_endpoint_name = model_sagemaker_endpoint_name
         else:
             raise ValueError(
@@ -2,23 +2,49 @@ import json
 import logging
 import os
 import tempfile
+import threading
+from functools import lru_cache
 from urllib.parse import urlparse
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from langchain_community.document_loaders.helpers import detect_file_encodings
 
 logger = logging.getLogger(__name__)
 
+# Matches the default multipart threshold of the S3 transfer manager
+SINGLE_PUT_MAX_BYTES = 8 * 1024 * 1024
+
+# Shared by every client so loaders running on worker threads reuse connections
+CLIENT_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=50,
+    retries={"mode": "adaptive", "max_attempts": 10},
+)
+_client_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _get_client(service_name, region):
+    # boto3's default session is not thread-safe while it creates clients
+    with _client_lock:
+        return boto3.client(service_name, region_name=region, config=CLIENT_CONFIG)
+
+
 def get_s3_client():
-    """Get S3 client with region from environment"""
+    """Get S3 client with region from environment (created once per process)"""
     region = os.getenv("AWS_REGION", "us-east-1")
-    return boto3.client("s3", region_name=region)
+    return _get_client("s3", region)
 
 def get_secrets_client():
-    """Get Secrets Manager client with region from environment"""
+    """Get Secrets Manager client with region from environment (created once per process)"""
     region = os.getenv("AWS_REGION", "us-east-1")
-    return boto3.client("secretsmanager", region_name=region)
+    return _get_client("secretsmanager", region)
+
+def get_client(service_name, region=None):
+    """Get a client for any service, safe to call from loader threads (created once per process and region)"""
+    return _get_client(service_name, region or os.getenv("AWS_REGION", "us-east-1"))
 
 
 def load_content_from_file(file_path: str, encoding: str = "utf-8"):
@@ -120,6 +146,10 @@ def upload_file_to_s3(bucket_name, object_key, local_path):
     """
     Upload a file to S3 from a local path.
 
+    Files below SINGLE_PUT_MAX_BYTES are sent with a single put_object call,
+    which avoids spinning up the multipart transfer manager and its thread
+    pool for small PDF chunks and inference requests.
+
     Args:
         bucket_name (str): Name of the S3 bucket
         object_key (str): S3 object key
@@ -128,7 +158,13 @@ def upload_file_to_s3(bucket_name, object_key, local_path):
     Returns:
         None
     """
-    get_s3_client().upload_file(local_path, bucket_name, object_key)
+    if os.path.getsize(local_path) > SINGLE_PUT_MAX_BYTES:
+        get_s3_client().upload_file(local_path, bucket_name, object_key)
+        return
+
+    with open(local_path, "rb") as f:
+        body = f.read()
+    get_s3_client().put_object(Bucket=bucket_name, Key=object_key, Body=body)
 
 
 def put_object_to_s3(bucket_name, object_key, content):
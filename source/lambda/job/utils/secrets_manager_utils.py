@@ -3,6 +3,7 @@ import logging
 import os
 
 import boto3
+from aws_secretsmanager_caching import SecretCache, SecretCacheConfig
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +13,12 @@ secrets_client = boto3.client(
     region_name=os.environ.get("AWS_REGION", "us-east-1")
 )
 
+# In-process cache so repeated lookups of the same secret skip Secrets Manager
+secret_cache = SecretCache(
+    config=SecretCacheConfig(secret_refresh_interval=3600),
+    client=secrets_client,
+)
+
 
 def get_api_key(api_secret_arn):
     """
@@ -22,11 +29,9 @@ def get_api_key(api_secret_arn):
         str: The API key.
     """
     try:
-        secret_response = secrets_client.get_secret_value(
-            SecretId=api_secret_arn
-        )
-        if "SecretString" in secret_response:
-            secret_data = json.loads(secret_response["SecretString"])
+        secret_string = secret_cache.get_secret_string(api_secret_arn)
+        if secret_string:
+            secret_data = json.loads(secret_string)
             api_key = secret_data.get("key")
             logger.info(
                 f"Successfully retrieved API key from secret ARN: {api_secret_arn}"
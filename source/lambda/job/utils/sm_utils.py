@@ -21,6 +21,7 @@ from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.messages import BaseMessage
 from langchain_core.outputs import GenerationChunk
 from langchain_core.pydantic_v1 import Extra, root_validator
+from utils.s3_utils import get_client
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -445,7 +446,7 @@ def SagemakerEndpointVectorOrCross(
         endpoint_kwargs = {"TargetModel": target_model}
     else:
         endpoint_kwargs = None
-    client = boto3.client("sagemaker-runtime", region_name=region_name)
+    client = get_client("sagemaker-runtime", region_name)
     if model_type == "vector" or model_type == "bce":
         content_handler = vectorContentHandler()
         embeddings = SagemakerEndpointEmbeddings(
@@ -503,12 +504,10 @@ def getCustomEmbeddings(
 
     if model_provider not in ["Bedrock API", "OpenAI API"]:
         # Use local models
-        client = boto3.client("sagemaker-runtime", region_name=region_name)
+        client = get_client("sagemaker-runtime", region_name)
 
         if model_provider == "Bedrock":
-            bedrock_client = boto3.client(
-                "bedrock-runtime", region_name=bedrock_region
-            )
+            bedrock_client = get_client("bedrock-runtime", bedrock_region)
             content_handler = BedrockEmbeddings()
             embeddings = BedrockEmbeddings(
                 client=bedrock_client,
@@ -1,7 +1,6 @@
 import logging
 import os
 import re
-import traceback
 import uuid
 from typing import Any, List
 
@@ -279,8 +278,7 @@ class MarkdownHeaderTextSplitter:
                     title_list.append(current_heading_level_map[title_level])
             joint_title_list = " ".join(title_list)
         except Exception as e:
-            traceback.print_exc()
-            print(f"Error: {e}")
+            logger.exception(f"Error: {e}")
             return ""
 
         return joint_title_list
@@ -431,3 +429,27 @@ class MarkdownHeaderTextSplitter:
             )
 
         return chunks
+
+
+class FastRecursiveSplitter(TextSplitter):
+    """Character-count splitter backed by the Rust semantic-text-splitter.
+
+    Drop-in for RecursiveCharacterTextSplitter in BatchChunkDocumentProcessor;
+    split_documents comes from TextSplitter, so metadata is copied per chunk
+    the same way. Chunk boundaries are not guaranteed to match the
+    recursive splitter exactly.
+    """
+
+    def __init__(self, chunk_size: int = 4000, chunk_overlap: int = 200, **kwargs: Any):
+        super().__init__(chunk_size=chunk_size, chunk_overlap=chunk_overlap, **kwargs)
+        try:
+            from semantic_text_splitter import TextSplitter as RustTextSplitter
+        except ImportError:
+            raise ImportError(
+                "semantic-text-splitter is not installed, please install it "
+                "with `pip install semantic-text-splitter`."
+            )
+        self._splitter = RustTextSplitter(chunk_size, overlap=chunk_overlap)
+
+    def split_text(self, text: str) -> List[str]:
+        return self._splitter.chunks(text)
@@ -3,9 +3,12 @@ Helper functions for storage intermediate content or log
 """
 
 import datetime
+import gzip
+import io
 import json
 import logging
 from urllib.parse import urlparse
+import orjson
 from botocore.exceptions import ClientError
 
 from langchain.docstore.document import Document
@@ -14,6 +17,16 @@ logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 
+def _dumps_line(obj) -> bytes:
+    """Serialize obj as one UTF-8 JSON line"""
+    return orjson.dumps(
+        obj,
+        option=orjson.OPT_APPEND_NEWLINE
+        | orjson.OPT_NON_STR_KEYS
+        | orjson.OPT_SERIALIZE_NUMPY,
+    )
+
+
 def upload_chunk_to_s3(
     s3, content: str, bucket: str, prefix: str, splitting_type: str, file_type: str
 ):
@@ -73,6 +86,53 @@ def save_content_to_s3(s3, document: Document, res_bucket: str, splitting_type:
     upload_chunk_to_s3(s3, metadata_json, res_bucket, filename, splitting_type, "metadata")
 
 
+class NDJSONDocumentWriter:
+    """Collect documents of one file into a gzipped NDJSON object
+
+    Written next to the per-document logs of save_content_to_s3 as
+    ``{filename}/{splitting_type}/{timestamp}/{time}-documents.ndjson.gz``,
+    one ``{"page_content": ..., "metadata": ...}`` line per document, so
+    a file costs one PUT per splitting type instead of two per document.
+    """
+
+    def __init__(self, splitting_type: str):
+        self.splitting_type = splitting_type
+        self.filename = None
+        self.count = 0
+        self._buffer = io.BytesIO()
+        self._gzip = gzip.GzipFile(fileobj=self._buffer, mode="wb")
+
+    def write(self, document: Document):
+        if self.filename is None:
+            file_path = document.metadata.get("file_path", "")
+            self.filename = file_path.split('/')[-1].rsplit('.', 1)[0]
+        self._gzip.write(
+            _dumps_line(
+                {"page_content": document.page_content, "metadata": document.metadata}
+            )
+        )
+        self.count += 1
+
+    def upload(self, s3, res_bucket: str):
+        """Upload the collected documents, if any, in a single PUT"""
+        self._gzip.close()
+        if not self.count:
+            return
+        timestamp = datetime.datetime.now().strftime("%Y-%m-%d-%H")
+        object_key = f"{self.filename}/{self.splitting_type}/{timestamp}/{datetime.datetime.now().strftime('%Y-%m-%d-%H-%M-%S-%f')}-documents.ndjson.gz"
+        try:
+            res = s3.put_object(
+                Bucket=res_bucket,
+                Key=object_key,
+                Body=self._buffer.getvalue(),
+                ContentType="application/x-ndjson",
+                ContentEncoding="gzip",
+            )
+            logger.debug(f"Upload {self.count} documents to S3: {res}")
+        except Exception as e:
+            logger.error(f"Error uploading documents to S3: {e}")
+
+
 def _s3_uri_exist(s3_client, s3_uri: str) -> bool:
     """Checks if an object exists at a given S3 URI. 
     eg. s3://bucket/folder/file.csv
@@ -1,18 +1,73 @@
-import json
+import asyncio
 import logging
+import multiprocessing
+import os
+import re
 import uuid
-from fastapi import FastAPI, HTTPException, Depends, status, Header
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from typing import Optional
+
+import orjson
+from fastapi import FastAPI, HTTPException, Depends, Response, status, Header
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from main import main
-from utils.api_key_validator import APIKeyValidator
+from utils import api_key_validator
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Document Conversion Service")
-api_validator = APIKeyValidator()
 
+# ETL jobs are CPU-bound; run them in worker processes so they neither hold
+# the GIL nor block the event loop serving /health and other requests. Each
+# worker loads the whole ETL stack, so size this to the task's CPU/memory.
+ETL_PROCESS_WORKERS = int(os.getenv("ETL_PROCESS_WORKERS", "1"))
+etl_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _create_executor() -> ProcessPoolExecutor:
+    # Workers are spawned rather than forked: the server already runs
+    # threads (event loop, threadpool) that fork could leave deadlocked
+    return ProcessPoolExecutor(
+        max_workers=ETL_PROCESS_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global etl_executor
+    etl_executor = _create_executor()
+    # Fetch the API key once at startup so the first request does not pay
+    # the Secrets Manager endpoint resolution, TLS handshake and lookup
+    await asyncio.to_thread(api_key_validator.warm_up)
+    try:
+        yield
+    finally:
+        etl_executor.shutdown(wait=True, cancel_futures=True)
+
+
+app = FastAPI(
+    title="Document Conversion Service",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
+
+# Static bodies are serialized once; ALB probes /health several times a second
+HEALTH_RESPONSE = Response(orjson.dumps({"status": "healthy"}), media_type="application/json")
+ROOT_RESPONSE = Response(
+    orjson.dumps({
+        "service": "Document Conversion Service",
+        "endpoints": {
+            "health": "/health",
+            "process": "/process",
+            "docs": "/docs"
+        }
+    }),
+    media_type="application/json",
+)
 
 class ETLRequest(BaseModel):
     """Request model for ETL processing"""
@@ -20,22 +75,23 @@ class ETLRequest(BaseModel):
     s3_prefix: str
 
 
-class RequestObj:
-    """Request object to mimic Lambda event structure"""
-    def __init__(self, data):
-        for key, value in data.items():
-            setattr(self, key, value)
+# Caller-supplied job ids become the DynamoDB executionId, so only uuids
+# (dashed or 32-char hex) are accepted
+JOB_ID_PATTERN = re.compile(
+    r"[0-9a-f]{8}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{12}", re.IGNORECASE
+)
 
 
 class Context:
     """Context object to mimic Lambda context"""
-    def __init__(self):
-        self.aws_request_id = str(uuid.uuid4())
+    def __init__(self, job_id: Optional[str] = None):
+        self.aws_request_id = job_id or str(uuid.uuid4())
 
 
 def validate_api_key(authorization: str = Header(None, alias="Authorization")):
     """Validate API key from Authorization header"""
-    logger.info(f"validate_api_key called with authorization: {authorization[:10] + '...' if authorization else 'None'}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("validate_api_key called with authorization: %s", authorization[:10] + '...' if authorization else 'None')
     auth_header = authorization
     
     if not auth_header:
@@ -45,8 +101,8 @@ def validate_api_key(authorization: str = Header(None, alias="Authorization")):
             detail="Missing Authorization header",
         )
     
-    is_valid = api_validator.validate_api_key(auth_header)
-    logger.info(f"API key validation result: {is_valid}")
+    is_valid = api_key_validator.validate_api_key(auth_header)
+    logger.info("API key validation result: %s", is_valid)
     
     if not is_valid:
         logger.warning(f"Invalid API key provided: {auth_header[:10] + '...'}")
@@ -59,81 +115,99 @@ def validate_api_key(authorization: str = Header(None, alias="Authorization")):
     return auth_header
 
 
+def validate_job_id(job_id: Optional[str] = Header(None, alias="X-Job-Id")):
+    """Validate the optional X-Job-Id header"""
+    if job_id is not None and not JOB_ID_PATTERN.fullmatch(job_id):
+        logger.warning("Invalid X-Job-Id header provided")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="X-Job-Id must be a UUID",
+        )
+    return job_id
+
+
 @app.get("/health")
 def health_check():
     """Health check endpoint for ALB"""
-    return {"status": "healthy"}
+    return HEALTH_RESPONSE
 
 
-@app.post("/process")
-async def process_etl(etl_request: ETLRequest, api_key: str = Depends(validate_api_key)):
-    """Main ETL processing endpoint"""
-    logger.info(f"process_etl called with etl_request: {etl_request}")
+def _run_job(etl_request: ETLRequest, job_id: str):
+    """Run main() inside a pool worker
+
+    The ETL stack (LangChain, OpenSearch, loaders) is imported here, in the
+    worker, so the server process never loads it.
+    """
+    from main import main
+
+    return main(etl_request, job_id)
+
+
+async def run_etl(etl_request: ETLRequest, job_id: Optional[str] = None) -> ORJSONResponse:
+    """Run one ETL job in the process pool and report its outcome"""
+    global etl_executor
+    executor = etl_executor
     try:
-        # Convert request to dict
-        data = etl_request.dict(exclude_none=True)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Received request: %s", etl_request.model_dump_json())
         
-        logger.info(f"Received request: {json.dumps(data)}")
-        
-        # Create request and context objects
-        req = RequestObj(data)
-        context = Context()
+        # main() reads the request fields as attributes, so the validated
+        # model is passed as is
+        context = Context(job_id)
         
         # Process the request
-        main(req, context.aws_request_id)
+        await asyncio.get_running_loop().run_in_executor(
+            executor, _run_job, etl_request, context.aws_request_id
+        )
         
-        return {
+        return ORJSONResponse({
             "status": "success",
             "message": "ETL process completed successfully",
             "job_id": context.aws_request_id
-        }
+        })
         
+    except BrokenProcessPool as e:
+        # A worker died (e.g. OOM on a large file) and the pool rejects all
+        # further work; replace it once so later jobs can run again
+        logger.exception(f"ETL worker process died: {str(e)}")
+        if etl_executor is executor:
+            etl_executor = _create_executor()
+            executor.shutdown(wait=False, cancel_futures=True)
+        return ORJSONResponse({
+            "status": "error",
+            "message": f"ETL worker process died: {str(e)}"
+        })
+
     except Exception as e:
-        logger.error(f"Error processing request: {str(e)}")
-        return {
+        logger.exception(f"Error processing request: {str(e)}")
+        return ORJSONResponse({
             "status": "error",
             "message": str(e)
-        }
+        })
+
+
+@app.post("/process")
+async def process_etl(
+    etl_request: ETLRequest,
+    api_key: str = Depends(validate_api_key),
+    job_id: Optional[str] = Depends(validate_job_id),
+):
+    """Main ETL processing endpoint"""
+    logger.info("process_etl called with etl_request: %s", etl_request)
+    return await run_etl(etl_request, job_id)
 
 
 @app.post("/process-pure")
 async def process_etl_pure(etl_request: ETLRequest):
-    """Main ETL processing endpoint"""
-    try:
-        # Convert request to dict
-        data = etl_request.dict(exclude_none=True)
-        
-        logger.info(f"Received request: {json.dumps(data)}")
-        
-        # Create request and context objects
-        req = RequestObj(data)
-        context = Context()
-        
-        # Process the request
-        main(req, context.aws_request_id)
-        
-        return {
-            "status": "success",
-            "message": "ETL process completed successfully",
-            "job_id": context.aws_request_id
-        }
-        
-    except Exception as e:
-        logger.error(f"Error processing request: {str(e)}")
-        return {
-            "status": "error",
-            "message": str(e)
-        }
+    """Main ETL processing endpoint without API key validation
+
+    X-Job-Id is not honoured here: an unauthenticated caller must not be
+    able to reuse another job's id and overwrite its ETL object rows.
+    """
+    return await run_etl(etl_request)
 
 
 @app.get("/")
 def root():
     """Root endpoint with service info"""
-    return {
-        "service": "Document Conversion Service",
-        "endpoints": {
-            "health": "/health",
-            "process": "/process",
-            "docs": "/docs"
-        }
-    }
\ No newline at end of file
+    return ROOT_RESPONSE